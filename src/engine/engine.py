@@ -17,12 +17,19 @@
 #
 
 
+import copy
+import logging
+from typing import Optional
+
 import numpy as np
 
 from src.engine.generator.baggen import Sequencer
+from src.engine.generator.base import Generator
 from src.engine.placement.field import Field
 from src.engine.placement.mover import Mover
-from src.engine.placement.piece import Piece, CoordFactory, Config
+from src.engine.placement.piece import Piece, Config
+
+_log = logging.getLogger(__name__)
 
 
 class Engine:
@@ -53,16 +60,41 @@ class Engine:
 
     """
 
-    def __init__(self, size: tuple[int, int]):
+    __slots__ = (
+        "_field",
+        "_size",
+        "_pid",
+        "_generator",
+        "_piece",
+        "_mover",
+        "_attempt_atomic",
+        "_attempt_multi",
+        "_attempt_maxout",
+        "_attempt_drop",
+        "_attempt_pre",
+        "_is_game_over",
+        "_verbose",
+    )
+
+    def __init__(self, size: tuple[int, int], verbose: bool = False):
+        """
+        :param size: size of the field
+        :param verbose: True to print the field on startup, after every freeze
+        and on quitting; False otherwise
+        """
+
+        self._verbose = verbose
+
         self._field = self.make_field(size)
-        self.field.print_field()
-        self._size = self.field.size
+        if verbose:
+            self._field.print_field()
+        self._size = self._field.size
 
         self._pid = None
         self._generator = Sequencer(np.arange(7))
 
         self._piece = None
-        self._mover = Mover(self.field)
+        self._bind_mover(Mover(self._field))
         self._is_game_over = False
 
     @property
@@ -82,7 +114,7 @@ class Engine:
         self._pid = value
 
     @property
-    def generator(self):
+    def generator(self) -> Generator:
         return self._generator
 
     @property
@@ -105,6 +137,53 @@ class Engine:
     def is_game_over(self, value: bool):
         self._is_game_over = value
 
+    @property
+    def verbose(self):
+        return self._verbose
+
+    def clone(self) -> "Engine":
+        """
+        Fork the current game, e.g., for a bot to play out some moves without
+        touching this game:
+        1.  the field is copied;
+        2.  the generator is copied, i.e., the fork will see the same pids;
+        3.  the piece is copied: its config can be modified in place (see
+        Piece.config), which must not move the piece of this game.
+
+        :return: the forked Engine
+        """
+
+        engine = Engine.__new__(Engine)
+        engine._verbose = self._verbose
+        engine._field = self._field.copy()
+        engine._size = self._size
+        engine._pid = self._pid
+        engine._generator = copy.deepcopy(self._generator)
+        if self._piece is not None:
+            engine._piece = Piece.from_init(self._piece.pid, self._piece.config.copy())
+        else:
+            engine._piece = None
+        engine._bind_mover(Mover(engine._field))
+        engine._is_game_over = self._is_game_over
+
+        return engine
+
+    def _bind_mover(self, mover: Mover) -> None:
+        """
+        Use a mover; its attempt_*() are bound once here, so that every move
+        is one attribute-load instead of two.
+
+        :param mover:
+        :return:
+        """
+
+        self._mover = mover
+        self._attempt_atomic = mover.attempt_atomic
+        self._attempt_multi = mover.attempt_multi
+        self._attempt_maxout = mover.attempt_maxout
+        self._attempt_drop = mover.attempt_drop
+        self._attempt_pre = mover.attempt_pre
+
     @staticmethod
     def make_field(size: tuple[int, int]) -> Field:
         """
@@ -142,11 +221,12 @@ class Engine:
 
         """
 
-        self.pid = self.generator.get_pids()[0]
+        self._pid = self._generator.get_pid()
 
         config = Config(np.array([-4, +0]), +0)
-        self.piece = Piece.from_init(self.pid, config)
-        print("Piece inited:", self.piece)
+        self._piece = Piece.from_init(self._pid, config)
+        if __debug__ and _log.isEnabledFor(logging.DEBUG):
+            _log.debug("Piece inited: %s", self._piece)
 
     def exec_pre(self, delta_rot: int, delta_pos1: int) -> None:
         """
@@ -157,14 +237,43 @@ class Engine:
         :return:
         """
 
-        result_pre = self.mover.attempt_pre(self.piece, delta_rot, delta_pos1)
+        result_pre = self._attempt_pre(self._piece, delta_rot, delta_pos1)
 
         if result_pre is not None:
-            self.piece = result_pre
-            print("PRE-Phase SUCCESSFUL:", self.piece)
+            self._piece = result_pre
+            if __debug__ and _log.isEnabledFor(logging.DEBUG):
+                _log.debug("PRE-Phase SUCCESSFUL: %s", self._piece)
         else:
-            self.is_game_over = True
-            print("PRE-Phase FAILED, GAMEOVER!")
+            self._is_game_over = True
+            _log.info("PRE-Phase FAILED, GAMEOVER!")
+
+    def _apply(
+        self, piece_new: Optional[Piece], move_name: str, move_type: int, move_arg
+    ) -> None:
+        """
+        Take over the result of an atomic or a multi from the mover:
+        1.  if move successful: self.piece is modified;
+        2.  if move failed: self.piece is not modified.
+
+        :param piece_new: result of the mover, None if the move failed
+        :param move_name: name of the move, for logging only
+        :param move_type: 0 for pos0, 1 for pos1; everything else for rot
+        :param move_arg: direction or delta of the move, for logging only
+        :return:
+        """
+
+        if piece_new is not None:
+            self._piece = piece_new
+            if __debug__ and _log.isEnabledFor(logging.DEBUG):
+                _log.debug(
+                    "%s of: %s @ %s successful: %s",
+                    move_name,
+                    move_type,
+                    move_arg,
+                    piece_new,
+                )
+        elif __debug__ and _log.isEnabledFor(logging.DEBUG):
+            _log.debug("%s of: %s @ %s FAILED!", move_name, move_type, move_arg)
 
     def exec_atomic(self, move_type: int, pos_dir: bool) -> None:
         """
@@ -180,14 +289,8 @@ class Engine:
         :return:
         """
 
-        piece_new = self.mover.attempt_atomic(move_type, self.piece, pos_dir)
-
-        if piece_new is not None:
-            self.piece = piece_new
-            print(self.piece)
-            print("ATOMIC of: {0} @ {1} successful".format(move_type, pos_dir))
-        else:
-            print("ATOMIC of: {0} @ {1} FAILED!".format(move_type, pos_dir))
+        piece_new = self._attempt_atomic(move_type, self._piece, pos_dir)
+        self._apply(piece_new, "ATOMIC", move_type, pos_dir)
 
     def exec_multi(self, move_type: int, delta: int) -> None:
         """
@@ -204,14 +307,8 @@ class Engine:
         :return:
         """
 
-        piece_new = self.mover.attempt_multi(move_type, self.piece, delta)
-
-        if piece_new is not None:
-            self.piece = piece_new
-            print(self.piece)
-            print("MULTI of: {0} @ {1} successful".format(move_type, delta))
-        else:
-            print("MULTI of: {0} @ {1} FAILED!".format(move_type, delta))
+        piece_new = self._attempt_multi(move_type, self._piece, delta)
+        self._apply(piece_new, "MULTI", move_type, delta)
 
     def exec_maxout(self, move_type: int, pos_dir: bool) -> None:
         """
@@ -225,7 +322,7 @@ class Engine:
         :return:
         """
 
-        self.piece = self.mover.attempt_maxout(move_type, self.piece, pos_dir)
+        self._piece = self._attempt_maxout(move_type, self._piece, pos_dir)
 
     def exec_drop(self) -> None:
         """
@@ -233,7 +330,7 @@ class Engine:
 
         :return:
         """
-        self.piece = self.mover.attempt_drop(self.piece)
+        self._piece = self._attempt_drop(self._piece)
 
     def exec_freeze(self) -> None:
         """
@@ -250,12 +347,18 @@ class Engine:
         :return:
         """
 
-        self.field.set_many(self.piece.coord, True)
+        pos0, pos1 = self._piece.config.pos.tolist()
+        if not self._field.place(self._piece.pid, self._piece.config.rot, pos0, pos1):
+            # the piece overlaps some boxes, e.g., if set by hand: write all of
+            # its boxes nonetheless, as set_many() always did
+            if __debug__ and _log.isEnabledFor(logging.DEBUG):
+                _log.debug("Piece does not fit, writing its coords: %s", self._piece)
+            self._field.set_many(self._piece.coord)
 
-        vertical_range = CoordFactory.get_range(self.pid, self.piece.config, True)
-        self.field.lineclear(vertical_range)
+        self._field.lineclear(self._piece.vertical_range)
 
-        self.field.print_field()
+        if self._verbose:
+            self._field.print_field()
 
     def clean_up(self) -> None:
         """
@@ -266,7 +369,8 @@ class Engine:
 
         """
 
-        self.field.print_field()
+        if self._verbose:
+            self._field.print_field()
         print("Quitting Shetris.")
 
 
@@ -0,0 +1,220 @@
+# The Tetris-Implementation of the Shetris-Project, written from scratch.
+#
+# Copyright (C) 2022 Shengdi 'shc' Chen (me@shengdichen.xyz)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+
+"""
+The bag-based generators of baggen, in pure python: popping, refilling and
+shuffling never call into NumPy.
+
+This is what baggen provides when running under PyPy, whose JIT handles plain
+python-ints and lists well, but has to go through its (slow) C-API emulation
+for every call into NumPy.
+
+NOTE:
+get_pids() still returns its pids as an np.ndarray, as does every Generator;
+get_pid(), the path taken on every spawn, stays free of NumPy.
+
+"""
+
+import logging
+import math
+import random
+from collections.abc import Iterable
+
+import numpy as np
+
+_log = logging.getLogger(__name__)
+
+
+class _Reservoir:
+    """
+    The same packed queue of ready pids as baggen's, i.e., one python-int with
+    one byte per pid, the first pid to pop in the lowest byte.
+
+    NOTE:
+    Every pid must fit into one byte, i.e., be within [0, 255].
+
+    """
+
+    __slots__ = ("_queue", "_size", "_refill_threshold")
+
+    def __init__(self, refill_threshold: int):
+        self._queue = 0
+        self._size = 0
+        self._refill_threshold = refill_threshold
+
+    @staticmethod
+    def pack(new_data: list[int]) -> int:
+        return int.from_bytes(bytes(new_data), "little")
+
+    def ready(self) -> list[int]:
+        return self._peek(self._size)
+
+    def _peek(self, n_items: int) -> list[int]:
+        # never more than the ready pids: to_bytes() would pad with pid 0
+        n_items = min(n_items, self._size)
+        first_items = self._queue & ((1 << (8 * n_items)) - 1)
+        return list(first_items.to_bytes(n_items, "little"))
+
+    def refill(self, new_data: list[int]) -> None:
+        self.refill_packed(_Reservoir.pack(new_data), len(new_data))
+
+    def refill_packed(self, packed: int, n_items: int) -> None:
+        self._queue |= packed << (8 * self._size)
+        self._size += n_items
+
+    def read_pop_check(self, n_items: int) -> tuple[list[int], bool]:
+        items = self._peek(n_items)
+        self._queue >>= 8
+        self._size -= 1
+        return items, self._size < self._refill_threshold
+
+    def pop_check(self) -> tuple[int, bool]:
+        item = self._queue & 0xFF
+        self._queue >>= 8
+        self._size -= 1
+        return item, self._size < self._refill_threshold
+
+
+class _GeneratorBag:
+    """
+    Template for bag-based generator: from the first generated pid on, every
+    consecutive bag-size pids hold each pid of the bag once and once only.
+
+    NOTE:
+    The bag can be any iterable of ints, e.g., a range or a NumPy-array; it is
+    stored as a tuple of python-ints.
+
+    """
+
+    refill_by = 20
+    refill_threshold = 10
+    pre_fill = 50
+
+    __slots__ = ("_bag", "_refill_by_bags", "_reservoir")
+
+    def __init__(self, bag: Iterable[int]):
+        self._bag = tuple(int(pid) for pid in bag)
+        self._refill_by_bags = math.ceil(_GeneratorBag.refill_by / len(self._bag))
+
+        self._reservoir = _Reservoir(_GeneratorBag.refill_threshold)
+
+        # pre-fill the reservoir
+        self.gen_bags(math.ceil(_GeneratorBag.pre_fill / len(self._bag)))
+
+    @property
+    def bag(self):
+        return self._bag
+
+    @property
+    def refill_by_bags(self):
+        return self._refill_by_bags
+
+    @property
+    def reservoir(self):
+        return self._reservoir
+
+    def gen_bag(self) -> list[int]:
+        raise NotImplementedError
+
+    def gen_bags(self, n_bags: int):
+        self._reservoir.refill(self.gen_many(n_bags))
+        self._log_ready()
+
+    def gen_many(self, n_bags: int) -> list[int]:
+        pids = []
+        for __ in range(n_bags):
+            pids += self.gen_bag()
+        return pids
+
+    def _log_ready(self) -> None:
+        if __debug__ and _log.isEnabledFor(logging.DEBUG):
+            _log.debug("Curr ready %s", self._reservoir.ready())
+
+    def get_pids(self, n_pids: int = 2) -> np.ndarray:
+        curr_pids, need_refill = self._reservoir.read_pop_check(n_pids)
+
+        if need_refill:
+            self.gen_bags(self._refill_by_bags)
+
+        return np.array(curr_pids, dtype=np.uint8)
+
+    def get_pid(self) -> int:
+        curr_pid, need_refill = self._reservoir.pop_check()
+
+        if need_refill:
+            self.gen_bags(self._refill_by_bags)
+
+        return curr_pid
+
+
+class Shuffler(_GeneratorBag):
+    """
+    Give me
+    1.  a bag
+    and I will give you
+    1.  this bag, shuffled by random.shuffle()
+
+    """
+
+    __slots__ = ("_shuffle",)
+
+    def __init__(self, bag: Iterable[int]):
+        self._shuffle = random.Random().shuffle
+        super().__init__(bag)
+
+    def gen_bag(self) -> list[int]:
+        new_bag = list(self._bag)
+        self._shuffle(new_bag)
+        return new_bag
+
+
+class Sequencer(_GeneratorBag):
+    """
+    Give me:
+    1.  a bag
+    and I will give you:
+    1.  the bag in its original order, over and over
+
+    """
+
+    __slots__ = ("_packed",)
+
+    def __init__(self, bag: Iterable[int]):
+        # n_bags -> the bag repeated n_bags times, packed for the reservoir
+        self._packed = {}
+        super().__init__(bag)
+
+    def gen_bag(self) -> list[int]:
+        return list(self._bag)
+
+    def gen_many(self, n_bags: int) -> list[int]:
+        return list(self._bag) * n_bags
+
+    def gen_bags(self, n_bags: int):
+        packed = self._packed.get(n_bags)
+        if packed is None:
+            packed = _Reservoir.pack(self.gen_many(n_bags))
+            self._packed[n_bags] = packed
+
+        self._reservoir.refill_packed(packed, n_bags * len(self._bag))
+        self._log_ready()
+
+
+if __name__ == "__main__":
+    pass
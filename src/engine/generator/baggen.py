@@ -17,29 +17,60 @@
 #
 
 
+import logging
 import math
+import sys
 
 import numpy as np
 
-from src.engine.generator.base import Generator
+_log = logging.getLogger(__name__)
 
 
 class _Reservoir:
+    """
+    A queue of ready pids, packed into one python-int with one byte per pid:
+    1.  the first pid to pop sits in the lowest byte;
+    2.  refill ORs the new pids in above the last ready pid;
+    3.  pop masks out the lowest byte, then shifts it away.
+    Thus no array is involved at all when popping pids.
+
+    NOTE:
+    Every pid must fit into one byte, i.e., be within [0, 255].
+
+    """
+
+    __slots__ = ("_queue", "_size", "_refill_threshold")
+
     def __init__(self, refill_threshold: int):
-        self._data = np.empty(0, dtype=np.uint8)
+        self._queue = 0
+        self._size = 0
         self._refill_threshold = refill_threshold
 
-    @property
-    def data(self):
-        return self._data
+    @staticmethod
+    def pack(new_data: np.ndarray) -> int:
+        """
+        Pack pids into the queue's format, the first pid in the lowest byte.
 
-    @data.setter
-    def data(self, value):
-        self._data = value
+        :param new_data:
+        :return:
+        """
 
-    @property
-    def refill_threshold(self):
-        return self._refill_threshold
+        return int.from_bytes(new_data.astype(np.uint8).tobytes(), "little")
+
+    def ready(self) -> np.ndarray:
+        """
+        Copy out all ready pids, in order of popping.
+
+        :return:
+        """
+
+        return self._peek(self._size)
+
+    def _peek(self, n_items: int) -> np.ndarray:
+        # never more than the ready pids: to_bytes() would pad with pid 0
+        n_items = min(n_items, self._size)
+        first_items = self._queue & ((1 << (8 * n_items)) - 1)
+        return np.frombuffer(first_items.to_bytes(n_items, "little"), dtype=np.uint8)
 
     def refill(self, new_data: np.ndarray) -> None:
         """
@@ -49,19 +80,19 @@ class _Reservoir:
         :return:
         """
 
-        self.data = np.append(self.data, new_data)
+        self.refill_packed(_Reservoir.pack(new_data), new_data.size)
 
-    def need_refill(self) -> bool:
+    def refill_packed(self, packed: int, n_items: int) -> None:
         """
-        Check if a refill is necessary
+        Refill the reservoir by |n_items| pids already packed by pack().
 
+        :param packed:
+        :param n_items:
         :return:
         """
 
-        if self.data.size < self.refill_threshold:
-            return True
-        else:
-            return False
+        self._queue |= packed << (8 * self._size)
+        self._size += n_items
 
     def read_pop_check(self, n_items: int) -> tuple[np.ndarray, bool]:
         """
@@ -69,19 +100,35 @@ class _Reservoir:
         1.  returns the first |n_items| items of the reservoir;
         2.  pop the very first item (by definition also the first item
         returned);
-        3.  runs check to signal if a refill is necessary.
+        3.  signal if a refill is necessary, i.e., if fewer than
+        refill_threshold items are left.
 
         Returns a tuple of (items, need_refill)
         :param n_items:
         :return:
         """
 
-        items = self.data[0:n_items]
-        self.data = self.data[1:]
-        return items, self.need_refill()
+        items = self._peek(n_items)
+        self._queue >>= 8
+        self._size -= 1
+        return items, self._size < self._refill_threshold
+
+    def pop_check(self) -> tuple[int, bool]:
+        """
+        The scalar version of read_pop_check() with one item: no array is
+        built.
+
+        Returns a tuple of (item, need_refill)
+        :return:
+        """
+
+        item = self._queue & 0xFF
+        self._queue >>= 8
+        self._size -= 1
+        return item, self._size < self._refill_threshold
 
 
-class _GeneratorBag(Generator):
+class _GeneratorBag:
     """
     Template for bag-based generator:
     Give me
@@ -102,6 +149,8 @@ class _GeneratorBag(Generator):
     # pre_load_amount = 100
     pre_fill = 50
 
+    __slots__ = ("_bag", "_refill_by_bags", "_reservoir")
+
     def __init__(self, bag: np.ndarray):
         self._bag = bag
         self._refill_by_bags = math.ceil(_GeneratorBag.refill_by / self.bag.size)
@@ -140,20 +189,43 @@ class _GeneratorBag(Generator):
         :return:
         """
 
-        for __ in range(n_bags):
-            new_bag = self.gen_bag()
-            self.reservoir.refill(new_bag)
+        self._reservoir.refill(self.gen_many(n_bags))
+        self._log_ready()
+
+    def gen_many(self, n_bags: int) -> np.ndarray:
+        """
+        Generate n_bags amount of bags as one contiguous array, so that they
+        can be written to the reservoir in one go.
+
+        Sub-classes are encouraged to override this with something better than
+        calling gen_bag() n_bags times.
 
-        print("Curr ready", self.reservoir.data)
+        :param n_bags:
+        :return:
+        """
 
-    def get_pids(self, n_pids: int = 2):
-        curr_pids, need_refill = self.reservoir.read_pop_check(n_pids)
+        return np.concatenate([self.gen_bag() for __ in range(n_bags)])
+
+    def _log_ready(self) -> None:
+        if __debug__ and _log.isEnabledFor(logging.DEBUG):
+            _log.debug("Curr ready %s", self._reservoir.ready())
+
+    def get_pids(self, n_pids: int = 2) -> np.ndarray:
+        curr_pids, need_refill = self._reservoir.read_pop_check(n_pids)
 
         if need_refill:
-            self.gen_bags(self.refill_by_bags)
+            self.gen_bags(self._refill_by_bags)
 
         return curr_pids
 
+    def get_pid(self) -> int:
+        curr_pid, need_refill = self._reservoir.pop_check()
+
+        if need_refill:
+            self.gen_bags(self._refill_by_bags)
+
+        return curr_pid
+
 
 class Shuffler(_GeneratorBag):
     """
@@ -167,8 +239,12 @@ class Shuffler(_GeneratorBag):
 
     """
 
+    __slots__ = ("_rng", "_scratch")
+
     def __init__(self, bag: np.ndarray):
         self._rng = np.random.default_rng()
+        # n_bags -> (n_bags * bag-size) scratch-buffer to shuffle in
+        self._scratch = {}
         super().__init__(bag)
 
     @property
@@ -176,7 +252,33 @@ class Shuffler(_GeneratorBag):
         return self._rng
 
     def gen_bag(self) -> np.ndarray:
-        return self.rng.permutation(self.bag)
+        return self._rng.permutation(self._bag)
+
+    def gen_many(self, n_bags: int) -> np.ndarray:
+        """
+        Shuffle all n_bags bags at once, as rows of a scratch-buffer.
+
+        NOTE:
+        The scratch-buffer is never reset to the original bag: each row holds
+        some permutation of the bag already, shuffling it again is just as
+        fair. Only two sizes are ever asked for (pre-fill and refill): the
+        scratch-buffers are thus allocated once.
+
+        NOTE:
+        A copy is returned: the scratch-buffer is shuffled again by the next
+        call with the same n_bags.
+
+        :param n_bags:
+        :return:
+        """
+
+        scratch = self._scratch.get(n_bags)
+        if scratch is None:
+            scratch = np.tile(self._bag, (n_bags, 1))
+            self._scratch[n_bags] = scratch
+
+        self._rng.permuted(scratch, axis=1, out=scratch)
+        return scratch.ravel().copy()
 
 
 class Sequencer(_GeneratorBag):
@@ -193,11 +295,45 @@ class Sequencer(_GeneratorBag):
 
     """
 
+    __slots__ = ("_packed",)
+
     def __init__(self, bag: np.ndarray):
+        # n_bags -> the bag tiled n_bags times, packed for the reservoir
+        self._packed = {}
         super().__init__(bag)
 
     def gen_bag(self) -> np.ndarray:
-        return self.bag
+        return self._bag
+
+    def gen_many(self, n_bags: int) -> np.ndarray:
+        return np.tile(self._bag, n_bags)
+
+    def gen_bags(self, n_bags: int):
+        """
+        Since every bag is the same, write all n_bags of them to the reservoir
+        in one go.
+
+        NOTE:
+        Only two sizes are ever asked for (pre-fill and refill): the tiled bags
+        are thus packed once, every refill is then one OR into the reservoir.
+
+        :param n_bags:
+        :return:
+        """
+
+        packed = self._packed.get(n_bags)
+        if packed is None:
+            packed = _Reservoir.pack(self.gen_many(n_bags))
+            self._packed[n_bags] = packed
+
+        self._reservoir.refill_packed(packed, n_bags * self._bag.size)
+        self._log_ready()
+
+
+if sys.implementation.name == "pypy":
+    # NumPy is slow behind PyPy's C-API emulation: provide the pure-python
+    # generators instead, with the same interface
+    from src.engine.generator._baggen_pure import Shuffler, Sequencer  # noqa: F811
 
 
 def bag_test():
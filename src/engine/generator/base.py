@@ -17,17 +17,20 @@
 #
 
 
-from abc import ABC, abstractmethod
+from typing import Protocol, runtime_checkable
 
+import numpy as np
 
-class Generator(ABC):
+
+@runtime_checkable
+class Generator(Protocol):
     """
-    The interface for the pid-generator
+    The interface for the pid-generator: any class providing these methods is
+    a generator, no need to inherit from this.
 
     """
 
-    @abstractmethod
-    def get_pids(self, n_pids: int = 2):
+    def get_pids(self, n_pids: int = 2) -> np.ndarray:
         """
         1.  Return the next n_pids of all ready pids
             ->  if (n_pids > 1) <=> (previewing enabled)
@@ -39,7 +42,17 @@ class Generator(ABC):
         :return:
         """
 
-        pass
+        ...
+
+    def get_pid(self) -> int:
+        """
+        Return the next pid (as a plain int) of all ready pids, without
+        previewing; otherwise identical to get_pids().
+
+        :return:
+        """
+
+        ...
 
 
 if __name__ == "__main__":
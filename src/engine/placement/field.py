@@ -17,11 +17,90 @@
 #
 
 
+import functools
 from typing import Optional
 
 import numpy as np
 
-from src.util.idxfac import IndexFactory
+from src.engine.placement.srs.coord import RelCoord
+
+
+def _make_piece_bottoms() -> tuple[tuple[tuple[tuple[int, int], ...], ...], ...]:
+    """
+    Pre-compute the bottom of every (pid, rot), i.e., the lowest box of the
+    piece in each of the cols it occupies, as one (col_offset, row_offset) pair
+    per col, relative to its ref-pos: these are the only boxes that can land
+    on something when dropping the piece.
+
+    :return: indexed as [pid][rot]
+    """
+
+    pid_bottoms = []
+    for rel_coords in RelCoord._rel_coords:
+        rot_bottoms = []
+        for rel_coord in rel_coords:
+            bottoms = {}
+            for row_offset, col in rel_coord.tolist():
+                bottoms[col] = max(bottoms.get(col, row_offset), row_offset)
+            rot_bottoms.append(tuple(sorted(bottoms.items())))
+        pid_bottoms.append(tuple(rot_bottoms))
+
+    return tuple(pid_bottoms)
+
+
+_PIECE_BOTTOMS = _make_piece_bottoms()
+
+
+@functools.lru_cache
+def _make_piece_boardmasks(n_cols: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Pre-compute the shape of every (pid, rot) as one mask on the board of a
+    field with n_cols cols (see Field), with its ref-pos at (0, 0): shifting it
+    by pos0 * n_cols + pos1 places the piece at the ref-pos (pos0, pos1).
+
+    :param n_cols: the number of cols of the field
+    :return: indexed as [pid][rot]
+    """
+
+    return tuple(
+        tuple(
+            sum(1 << (row * n_cols + col) for row, col in rel_coord.tolist())
+            for rel_coord in rel_coords
+        )
+        for rel_coords in RelCoord._rel_coords
+    )
+
+
+@functools.lru_cache
+def _make_placements(n_rows: int, n_cols: int) -> dict[tuple[int, int, int, int], int]:
+    """
+    Pre-compute the mask on the board of every placement that lies within the
+    boundaries of a field of n_rows * n_cols, i.e., of every:
+    1.  pid
+    2.  rot
+    3.  ref-pos (pos0, pos1)
+    with all boxes of the piece inside the field.
+
+    :param n_rows: the number of rows of the field
+    :param n_cols: the number of cols of the field
+    :return: {(pid, rot, pos0, pos1): mask}, placements beyond the boundaries
+    are absent
+    """
+
+    placements = {}
+    for pid, rel_coords in enumerate(RelCoord._rel_coords):
+        for rot, rel_coord in enumerate(rel_coords):
+            min0, min1 = rel_coord.min(axis=0).tolist()
+            max0, max1 = rel_coord.max(axis=0).tolist()
+            mask = sum(1 << (row * n_cols + col) for row, col in rel_coord.tolist())
+            for pos0 in range(-min0, n_rows - max0):
+                for pos1 in range(-min1, n_cols - max1):
+                    shift = pos0 * n_cols + pos1
+                    placements[pid, rot, pos0, pos1] = (
+                        mask << shift if shift >= 0 else mask >> -shift
+                    )
+
+    return placements
 
 
 class Field:
@@ -31,42 +110,123 @@ class Field:
         Give me coords,
         Tell you the values there.
     2.  Checks:
-        Give me coords,
-        Tell you if exceeded boundaries or has collision.
+        Give me a placement (pid, rot, ref-pos),
+        Tell you if it fits, i.e., stays within the boundaries and has no
+        collision.
     3.  Line-Clear operation
         Given me nothing,
         Remove full lines, shift everything above that downwards
         This includes the following operations:
         a.  report full rows;
-        b.  report indexes of non-zero entries
-        c.  write to new values based on np's (advanced-)indexing
+        b.  keep the row-masks of all other rows;
+        c.  write the kept row-masks back onto the board, bottom-aligned
     4.  Write-backs:
-        Given me coords (checked: no exceeding boundaries, no collisions)
-        Write True back to the field in these coords.
+        Give me a placement (checked: no exceeding boundaries, no collisions)
+        OR the mask of the placement onto the board.
 
-    """
+    Storage:
+    The field is stored as a bitboard: one (python) int for the whole field,
+    where bit r * n_cols + c is set if and only if the entry (r, c) is True.
+    Thus, the bits of a row form one row-mask, a full row is simply a row-mask
+    equal to full_row, and a piece (of any shape) collides iff its own mask
+    (see _make_piece_boardmasks()) ANDed with the board is non-zero. The
+    2D-array of bools is only rebuilt on demand (see field).
 
-    # format:
-    # "check_string": [checking_in_pos0, checking_in_pos_dir]
-    check_strings_to_internals = {
-        "U": [True, False],
-        "D": [True, True],
-        "L": [False, False],
-        "R": [False, True],
-    }
+    """
 
     def __init__(self, field: np.ndarray):
-        self._field = field
+        """
+        :param field: the 2D-array of bools to start with
+        """
+
         self._size = field.shape
+        self._n_rows, self._n_cols = self._size
+        self._full_row = (1 << self._n_cols) - 1
+        # bit r * n_cols is set for every row r: the (leftmost) col-mask
+        self._full_col = sum(1 << row * self._n_cols for row in range(self._n_rows))
+        self._piece_masks = _make_piece_boardmasks(self._n_cols)
+        self._placements = _make_placements(self._n_rows, self._n_cols)
+
+        # row-major: bit r * n_cols + c is the entry (r, c)
+        self._board = int.from_bytes(
+            np.packbits(field.astype(bool).ravel(), bitorder="little").tobytes(),
+            "little",
+        )
 
     @property
-    def field(self):
-        return self._field
+    def field(self) -> np.ndarray:
+        """
+        Rebuild the 2D-array of bools from the board.
+
+        NOTE:
+        This is a snapshot: writing to it does NOT modify the field.
+
+        :return:
+        """
+
+        cols = np.arange(self._n_cols)
+        return ((self.rows[:, np.newaxis] >> cols) & 1).astype(bool)
 
     @property
     def size(self):
         return self._size
 
+    @property
+    def full_row(self):
+        return self._full_row
+
+    @property
+    def board(self):
+        return self._board
+
+    @property
+    def rows(self) -> np.ndarray:
+        """
+        Rebuild the row-masks (one unsigned int per row) from the board.
+
+        NOTE:
+        This is a snapshot: writing to it does NOT modify the field.
+
+        :return:
+        """
+
+        dtype = np.min_scalar_type(self._full_row)
+        return np.array(self._rows_list(0, self._n_rows), dtype=dtype)
+
+    def _rows_list(self, lower_than: int, higher_than: int) -> list[int]:
+        """
+        Extract the row-masks of a (continuous) range of rows.
+
+        :param lower_than: the first row
+        :param higher_than: one past the last row, in the usual range()
+        convention
+        :return:
+        """
+
+        board, n_cols, full_row = self._board, self._n_cols, self._full_row
+        return [
+            board >> (row * n_cols) & full_row for row in range(lower_than, higher_than)
+        ]
+
+    def copy(self) -> "Field":
+        """
+        Make an independent copy of this field.
+
+        :return:
+        """
+
+        field = Field.__new__(Field)
+        field._size = self._size
+        field._n_rows, field._n_cols = self._n_rows, self._n_cols
+        field._full_row = self._full_row
+        field._full_col = self._full_col
+        field._piece_masks = self._piece_masks
+        field._placements = self._placements
+        # python ints are immutable: sharing is copying
+        field._board = self._board
+
+        return field
+
     def print_field(self):
         """
         print every entry as 1 or 0, instead of True or False,
@@ -74,14 +234,9 @@ class Field:
 
         """
 
-        def print_bool_as_int(my_bool):
-            return str(int(my_bool))
-
-        np.set_printoptions(formatter={"bool": print_bool_as_int})
-        print(self.field)
-
-        # reset printoptions
-        np.set_printoptions()
+        # format locally: np.set_printoptions() would modify (global) state
+        # shared with every other field
+        print(np.array2string(self.field.astype(np.uint8)))
 
     @staticmethod
     def unpack_coord(coord: np.ndarray) -> tuple[int, int]:
@@ -106,7 +261,9 @@ class Field:
         :param coord: np.ndarray
         :return: the entry at the coord
         """
-        return self.field[Field.unpack_coord(coord)]
+
+        row, col = Field.unpack_coord(coord)
+        return bool(self._board >> (row * self._n_cols + col) & 1)
 
     def at(self, coords: np.ndarray) -> np.ndarray:
         """
@@ -117,15 +274,12 @@ class Field:
         :param coords: the queried coordinates
         :return: the entries at the queried coordinates
         """
-        n_entries_queried = coords.shape[0]
-        states = np.empty(n_entries_queried, dtype=bool)
-
-        for i in range(n_entries_queried):
-            curr_coord = coords[i]
-            #   print(curr_coord)
-            states[i] = self.at_one(curr_coord)
 
-        return states
+        board, n_cols = self._board, self._n_cols
+        return np.array(
+            [board >> (row * n_cols + col) & 1 for row, col in coords.tolist()],
+            dtype=bool,
+        )
 
     def has_collision(self, candidates: np.ndarray) -> bool:
         """
@@ -135,55 +289,136 @@ class Field:
         :return: True if collision exists, False otherwise
         """
 
-        curr_vals = self.at(candidates)
+        # a piece has only a handful of boxes: scanning them one by one in
+        # python (with early exit) beats the dispatch-cost of numpy's gather
+        board, n_cols = self._board, self._n_cols
+        for row, col in candidates.tolist():
+            if board >> (row * n_cols + col) & 1:
+                return True
+        return False
+
+    def has_collision_piece(self, pid: int, rot: int, pos0: int, pos1: int) -> bool:
+        """
+        Check if a piece, given by its pid, rot and ref-pos, collides with the
+        existing field.
+
+        NOTE:
+        Unlike has_collision(), no coordinates are needed: the mask of the
+        piece is looked up, shifted to the ref-pos and ANDed with the board.
+
+        NOTE:
+        It is up to the caller to guarantee that the piece is within the
+        boundaries of the field.
+
+        :param pid:
+        :param rot:
+        :param pos0:
+        :param pos1: can be negative, as the piece could have empty cols on its
+        left (e.g., I-piece in rot 1)
+        :return: True if collision exists, False otherwise
+        """
+
+        # within the boundaries, no bit of the piece is shifted out, even if
+        # the shift is negative (ref-pos at pos0 == 0, pos1 < 0)
+        shift = pos0 * self._n_cols + pos1
+        mask = self._piece_masks[pid][rot]
+        if shift >= 0:
+            return bool(self._board & mask << shift)
+        return bool(self._board & mask >> -shift)
 
-        return np.any(curr_vals)
+    def placement_mask(self, pid: int, rot: int, pos0: int, pos1: int) -> Optional[int]:
+        """
+        Look up the mask on the board of a piece, given by its pid, rot and
+        ref-pos.
 
-    def _exceeded_boundary(
-        self, in_pos0: bool, in_pos_dir: bool, candidates: np.ndarray
-    ) -> np.bool_:
+        :param pid:
+        :param rot:
+        :param pos0:
+        :param pos1:
+        :return: the mask; None if the piece exceeds any boundary
         """
-        Check if any of the candidates-coordinates have exceeded one specific
-        boundary of the four "walls".
 
-        :param in_pos0: bool
-            True if in pos0 (check vertically);
-            False if in pos1 (check horizontally)
-        :param in_pos_dir: True if in negative direction, False otherwise
-        :param candidates: coordinates (2D!, we will extract the
-        relevant 1D coords in method!)
+        return self._placements.get((pid, rot, pos0, pos1))
 
-        :return:
+    def fits(self, pid: int, rot: int, pos0: int, pos1: int) -> bool:
         """
+        Check if a piece, given by its pid, rot and ref-pos, is within all
+        boundaries and does not collide with the existing field.
 
-        candidates_to_check = candidates[:, 0] if in_pos0 else candidates[:, 1]
+        NOTE:
+        Both checks are one look-up in the table of placements and one AND.
 
-        if in_pos_dir:
-            np_checkers = (np.max, np.greater)
-            if in_pos0:
-                boundary = self.size[0] - 1
-            else:
-                boundary = self.size[1] - 1
-        else:
-            boundary = 0
-            np_checkers = (np.min, np.less)
+        :param pid:
+        :param rot:
+        :param pos0:
+        :param pos1:
+        :return: True if the piece can be placed there, False otherwise
+        """
 
-        def _check_util_1d(
-            _candidates_1d: np.ndarray, _boundary: int, _np_checkers: tuple
-        ) -> np.bool_:
-            """
-            check boundary against some boundary
+        mask = self._placements.get((pid, rot, pos0, pos1))
+        return mask is not None and not self._board & mask
 
-            :param _candidates_1d: 1D np.array (all rows or all cols)
-            :param _boundary:
-            :param _np_checkers:
-            :return:
-            """
+    def place(self, pid: int, rot: int, pos0: int, pos1: int) -> bool:
+        """
+        Place a piece, given by its pid, rot and ref-pos, on the field, i.e.,
+        write True back to all of its boxes; if it does not fit (see fits()),
+        leave the field untouched.
 
-            worst_candidate = _np_checkers[0](_candidates_1d)
-            return _np_checkers[1](worst_candidate, _boundary)
+        Usage:
+        1.  after a piece has finished moving, place it before envoking the
+        line-clear; the check and the write-back are then one look-up in the
+        table of placements, one AND and one OR.
 
-        return _check_util_1d(candidates_to_check, boundary, np_checkers)
+        :param pid:
+        :param rot:
+        :param pos0:
+        :param pos1:
+        :return: True if placed, False otherwise
+        """
+
+        mask = self._placements.get((pid, rot, pos0, pos1))
+        if mask is None or self._board & mask:
+            return False
+
+        self._board |= mask
+        return True
+
+    def drop_distance(self, pid: int, rot: int, pos0: int, pos1: int) -> int:
+        """
+        Find how many rows a piece, given by its pid, rot and ref-pos, can drop
+        from there before landing on the field or its floor.
+
+        NOTE:
+        Only the lowest box in each col of the piece can land (see
+        _make_piece_bottoms()): for each of them, the board above the box is
+        shifted out and the col below it is masked in, such that the lowest
+        set bit of what remains is the first obstacle in that col. Overhangs
+        are thus handled correctly, unlike with col-heights.
+
+        NOTE:
+        It is up to the caller to guarantee that the piece is within the
+        boundaries of the field and does not collide with it.
+
+        :param pid:
+        :param rot:
+        :param pos0:
+        :param pos1:
+        :return: the number of rows the piece can drop, 0 if it cannot drop
+        """
+
+        board, n_cols, full_col = self._board, self._n_cols, self._full_col
+
+        distance = self._n_rows
+        for col_offset, row_offset in _PIECE_BOTTOMS[pid][rot]:
+            row_below = pos0 + row_offset + 1
+            below = board >> (row_below * n_cols + pos1 + col_offset) & full_col
+            if below:
+                distance_col = ((below & -below).bit_length() - 1) // n_cols
+            else:
+                distance_col = self._n_rows - row_below
+            if distance_col < distance:
+                distance = distance_col
+        return distance
 
     def exceeded_boundaries(
         self, boundaries_string: str, candidates: np.ndarray
@@ -192,23 +427,27 @@ class Field:
         Boundary-checks for multiple boundaries.
 
         NOTE:
-        Short-circuiting is performed: as soon as one boundary-check is failed,
-        return immediately.
+        Only the extremes needed by the requested boundaries are computed, each
+        being a scalar comparison; short-circuiting is performed: as soon as one
+        boundary-check is failed, return immediately.
 
         :param boundaries_string: any subset of "LRUD"
         :param candidates:
         :return:
         """
 
-        for check_string in boundaries_string:
-            in_pos0, in_pos_dir = Field.check_strings_to_internals[check_string]
-            exceeded_curr = self._exceeded_boundary(in_pos0, in_pos_dir, candidates)
-            if exceeded_curr:
-                return True
+        # a piece has only a handful of boxes: python's min()/max() over plain
+        # lists beat a ufunc-call per reduction
+        rows, cols = candidates.T.tolist()
 
-        return False
+        return (
+            ("U" in boundaries_string and min(rows) < 0)
+            or ("D" in boundaries_string and max(rows) >= self._n_rows)
+            or ("L" in boundaries_string and min(cols) < 0)
+            or ("R" in boundaries_string and max(cols) >= self._n_cols)
+        )
 
-    def _full_row_num(self, target_range: tuple[int, int]) -> Optional[np.ndarray]:
+    def _full_row_num(self, target_range: tuple[int, int]) -> np.ndarray:
         """
         Find numbers (indexes) of all full rows.
 
@@ -227,63 +466,23 @@ class Field:
 
         :param target_range: (Continuous) range of rows to look for full-rows
         within.
-        :return: indexes (1D np.ndarray) of full-rows.
+        :return: indexes (1D np.ndarray) of full-rows; empty if there are none.
         """
 
         lower_than, higher_than = target_range
-        target_field = self.field[lower_than:higher_than, :]
-
-        # a vector of n_rows: True if a row is full, False otherwise
-        is_fullrow = np.all(target_field, axis=1)
-        # nonzero() returns a tuple for np's advanced indexing: fish out with
-        # [0]
-        fullrow_numbers = np.nonzero(is_fullrow)[0]
-        print(fullrow_numbers)
-
-        if fullrow_numbers.size == 0:
-            return None
-        # must add back the starting position if we did not look at the whole
-        # field
-        return fullrow_numbers + lower_than
-
-    def idx_nonzero(self, higher_than: int) -> tuple[np.ndarray, np.ndarray]:
-        """
-        Get numpy-indexes of non-zero boxes, if a range is provided (a tuple),
-        use this for slicing.
-
-        :param higher_than: typically: above_row is the highest row to be
-        cleared next
-        :return: numpy-indexes of non-zero entries
-        """
 
-        if higher_than is None:
-            # 0-indexing
-            #   -> this is one row BELOW the lowest row of the field
-            #   -> look at the whole field!
-            higher_than = self.size[0]
-        field_view = self.field[:higher_than, :]
-
-        idx_view = np.nonzero(field_view)
-        return idx_view
-
-    def set_from_idx(self, idx: tuple[np.ndarray, np.ndarray], new_val: bool):
-        """
-        Set entries at provided numpy-indexes to new value.
-
-        :param idx:
-        :param new_val:
-        :return:
-        """
+        # the span of a piece is at most four rows: a plain scan avoids the
+        # compare-then-nonzero round trip through numpy
+        full_row = self._full_row
+        fullrow_numbers = [
+            row
+            for row, val in enumerate(
+                self._rows_list(lower_than, higher_than), lower_than
+            )
+            if val == full_row
+        ]
 
-        self.field[idx] = new_val
-
-    def set_from_idx_pair(
-        self,
-        idx_old: tuple[np.ndarray, np.ndarray],
-        idx_new: tuple[np.ndarray, np.ndarray],
-    ):
-        self.set_from_idx(idx_old, False)
-        self.set_from_idx(idx_new, True)
+        return np.array(fullrow_numbers, dtype=int)
 
     def lineclear(self, span_of_piece: Optional[np.ndarray] = None):
         """
@@ -296,9 +495,8 @@ class Field:
         2.  if there are no lines to clear:
             ->  return immediately
         3.  if there are full lines:
-            ->  break them into consecutive chunks (routine defined below)
-            ->  from the highest (lowest index in np) chunk to the lowest:
-                ->  perform line-clear on each chunk (routine defined below)
+            ->  drop all of them at once, sliding the remaining rows above
+            them downwards (routine defined below)
 
         NOTE:
         1.  the (vertical) span of a piece must be provided as:
@@ -313,87 +511,51 @@ class Field:
             # 0-indexing:
             #   -> this is one row BELOW the lowest row of the field
             #   -> look at the whole field!
-            target_range = 0, self.size[0]
+            target_range = 0, self._n_rows
         else:
-            target_range = span_of_piece
+            # as python ints: np-ints would overflow when shifting the board
+            lower_than, higher_than = map(int, span_of_piece)
+            target_range = lower_than, higher_than
 
         full_rows = self._full_row_num(target_range)
-        if full_rows is not None:
-            for chunk in Field._break_into_chunks(full_rows):
-                self._lineclear_chunk(chunk)
+        if full_rows.size:
+            self._compact_rows(target_range)
 
-    @staticmethod
-    def _break_into_chunks(all_lines: np.ndarray) -> list[np.ndarray]:
+    def _compact_rows(self, target_range: tuple[int, int]) -> None:
         """
-        Utility to break indexes of all full lines into consecutive chunks.
-
-
-        The input (all_liens) is supposed to be:
-        0.  all integers
-        1.  strictly increasing (as is the result when querying full-lines)
-        2.  not empty (containing at least one element)
-
-        E.g.,
-        [IN]
-            all_lines = np.array([1, 2, 3, 4, 6, 7, 9, 11])
-        [OUT]
-            [array([1, 2, 3, 4]), array([6, 7]), array([9]), array([11])]
-        [IN]
-            all_lines = np.array([1])
-        [OUT]
-            [array([1])]
-
-        :param all_lines: indexes of all full lines.
-        :return: a list of np.ndarrays, each a consecutive sequence of
-        index(es).
-        """
-
-        curr = np.array((all_lines[0],))
-        chunks = []
-
-        for idx in all_lines[1:]:
-            if idx == curr[-1] + 1:
-                curr = np.append(curr, idx)
-            else:
-                chunks.append(curr)
-
-                curr = np.array((idx,))
-
-        # must manually add the last chunk
-        chunks.append(curr)
-
-        return chunks
-
-    def _set_rows(self, rows: np.ndarray, new_val=False) -> None:
-        """
-        Set all row-numbers into new value.
-
-        :param rows: the rows to set
-        :param new_val: the value to set them to
-        """
-
-        self.field[(rows,)] = new_val
-
-    def _lineclear_chunk(self, chunk: np.ndarray) -> None:
-        """
-        Perform line-clear within a chunk of consecutive lines.
+        Remove all full rows within the target range in one pass:
+        1.  keep every row (down to the bottom of the target range) that is
+        either outside of the target range or not full;
+        2.  write the kept rows back, aligned to the bottom of the target range;
+        3.  set the (now vacated) topmost rows to 0
 
         NOTE:
-        It is up to the caller to guarantee that chunk is not empty, i.e.,
-        there is at least one line to clear.
+        The rows below the target range are not touched.
 
-        1.  set all rows of the chunk to 0;
-        2.  move everything (strictly) above the top of the chunk downwards
+        NOTE:
+        This replaces breaking the full rows into consecutive chunks and
+        clearing them one chunk at a time: the result is the same, no matter
+        how the full rows are spread.
 
+        :param target_range: (Continuous) range of rows to clear full-rows
+        within, in the usual range() convention.
         :return:
         """
 
-        self._set_rows(chunk, False)
-        higher_than, n_full_rows = np.min(chunk), chunk.shape[0]
+        lower_than, higher_than = target_range
+        n_cols, full_row = self._n_cols, self._full_row
+
+        kept = self._rows_list(0, lower_than) + [
+            row for row in self._rows_list(lower_than, higher_than) if row != full_row
+        ]
 
-        idx_nonzero = self.idx_nonzero(higher_than)
-        idx_new = IndexFactory.make_shifted_pos0(idx_nonzero, n_full_rows)
-        self.set_from_idx_pair(idx_nonzero, idx_new)
+        # the untouched rows below, then the kept rows, bottom-aligned
+        n_below = higher_than * n_cols
+        board = self._board >> n_below << n_below
+        n_cleared = higher_than - len(kept)
+        for row, val in enumerate(kept, n_cleared):
+            board |= val << (row * n_cols)
+        self._board = board
 
     def _set_one(self, coord: np.ndarray, new_val: bool = True) -> None:
         """
@@ -403,7 +565,11 @@ class Field:
         :param new_val:
         """
 
-        self.field[self.unpack_coord(coord)] = new_val
+        row, col = self.unpack_coord(coord)
+        if new_val:
+            self._board |= 1 << (row * self._n_cols + col)
+        else:
+            self._board &= ~(1 << (row * self._n_cols + col))
 
     def set_many(self, coords: np.ndarray, new_val: bool = True) -> None:
         """
@@ -417,8 +583,15 @@ class Field:
         :param new_val:
         """
 
-        for coord in coords:
-            self._set_one(coord, new_val)
+        n_cols = self._n_cols
+        mask = 0
+        for row, col in coords.tolist():
+            mask |= 1 << (row * n_cols + col)
+
+        if new_val:
+            self._board |= mask
+        else:
+            self._board &= ~mask
 
 
 def run_field_init():
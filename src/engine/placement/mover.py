@@ -17,15 +17,44 @@
 #
 
 
-from typing import Optional
+import logging
+import sys
+from typing import Callable, Optional
 
 import numpy as np
 
 from src.engine.placement.field import Field
-from src.engine.placement.piece import Piece
+from src.engine.placement.piece import Config, Piece
 from src.engine.placement.srs.coord import RelCoord
 from src.engine.placement.srs.kick import Kick
 
+_log = logging.getLogger(__name__)
+
+
+def _make_srs_shifts() -> tuple[tuple[tuple[tuple[tuple[int, int], ...], ...], ...]]:
+    """
+    Pre-compute the srs-shift candidates (see Kick) of every pid, rot and
+    direction of the rotation as (nested) python ints, such that trying them
+    needs neither a call into Kick nor a conversion from np.
+
+    :return: indexed as [pid][rot][positive_dir], each a tuple of
+    (shift0, shift1)
+    """
+
+    return tuple(
+        tuple(
+            tuple(
+                tuple(map(tuple, srs[2 * rot + (1 - positive_dir)].tolist()))
+                for positive_dir in (False, True)
+            )
+            for rot in range(4)
+        )
+        for srs in Kick.srs_table
+    )
+
+
+_SRS_SHIFTS = _make_srs_shifts()
+
 
 class Mover:
     """
@@ -38,12 +67,25 @@ class Mover:
 
     """
 
-    check_string_to_check_tuple = {
-        "U": [True, False],
-        "D": [True, True],
-        "L": [False, False],
-        "R": [False, True],
-    }
+    # the boundaries to check are passed around as a check-mask, i.e., the OR
+    # of the check-bits below, instead of a check-string (any subset of "LRUD")
+    check_bit_l, check_bit_r, check_bit_u, check_bit_d = 1, 2, 4, 8
+    check_bits_all = 15
+
+    # format: (check_string, check_bit)
+    _boundaries = (
+        ("L", check_bit_l),
+        ("R", check_bit_r),
+        ("U", check_bit_u),
+        ("D", check_bit_d),
+    )
+
+    # format: [atomic_type][positive_dir]
+    _atomic_to_check_masks = (
+        (check_bit_u, check_bit_d),
+        (check_bit_l, check_bit_r),
+        (check_bits_all, check_bits_all),
+    )
 
     def __init__(self, field: Field) -> None:
         """
@@ -54,6 +96,15 @@ class Mover:
 
         self._field = field
         self._analyzer = BoundaryAnalyzer(self.field.size)
+        # format: [pid][rot]
+        self._bad_boundaries = self._analyzer.boundary_checkers
+
+        # format: [move_type], with any move_type other than 0 and 1 sent to rot
+        self._atomic_movers = (
+            self.attempt_atomic_pos0,
+            self.attempt_atomic_pos1,
+            self.attempt_atomic_rot,
+        )
 
     @property
     def field(self):
@@ -64,9 +115,24 @@ class Mover:
         return self._analyzer
 
     @staticmethod
-    def _atomic_to_check_string(atomic_type: int, positive_dir: bool) -> str:
+    def check_string_to_mask(check_string: str) -> int:
+        """
+        Convert a check-string to the corresponding check-mask.
+
+        :param check_string: any subset of "LRUD"
+        :return:
         """
-        Get the boundary-check-string of an atomic:
+
+        check_mask = 0
+        for boundary, check_bit in Mover._boundaries:
+            if boundary in check_string:
+                check_mask |= check_bit
+        return check_mask
+
+    @staticmethod
+    def _atomic_to_check_mask(atomic_type: int, positive_dir: bool) -> int:
+        """
+        Get the boundary-check-mask of an atomic:
         i.  if moving left: check left-boundary;
         ii. if moving right: check right-boundary;
         etc.
@@ -78,96 +144,80 @@ class Mover:
         :return:
         """
 
-        if atomic_type == 0:
-            if positive_dir:
-                check_string = "D"
-            else:
-                check_string = "U"
-        elif atomic_type == 1:
-            if positive_dir:
-                check_string = "R"
-            else:
-                check_string = "L"
-        else:
-            check_string = "LRUD"
-
-        return check_string
-
-    def _failed_boundaries_collision(
-        self, check_string: str, candidates: np.ndarray
-    ) -> bool:
-        """
-        Check if boundaries- or collision-checks failed.
-
-        NOTE:
-        This is our standard check for any move: both atomic and multi.
-
-        NOTE:
-        Short-circuiting is used: boundary-checks are performed first, then the
-        collision check. Returns As soon as one check fails. This ordering is
-        intentional: the field is expected to be generally unoccupied, thus,
-        the chances of exceeding some boundary (or boundaries) are expected to
-        be higher than that of producing a collision.
-
-        :param check_string: which boundaries to check
-        :param candidates: potential coordinates (usually 4 of a piece)
-        :return: True if failed checks (bad candidates); False otherwise
-        """
-
-        if self.field.exceeded_boundaries(check_string, candidates):
-            return True
-
-        if self.field.has_collision(candidates):
-            return True
-
-        return False
+        if atomic_type != 0 and atomic_type != 1:
+            atomic_type = 2
+        return Mover._atomic_to_check_masks[atomic_type][positive_dir]
 
-    def _attempt_atomic_pos(
-        self, piece: Piece, in_pos0: bool, positive_dir: bool
-    ) -> Optional[Piece]:
+    def _slide(
+        self, piece: Piece, in_pos0: bool, positive_dir: bool, max_atomics: int
+    ) -> int:
         """
-        Attempt an atomic in pos0 or pos1.
-        1.  first convert an atomic to the cooresponding check-string
-        2.  perform the boundary-collision check
+        Perform atomics in pos0 or pos1 on the plain ints of a piece, until
+        one of them fails.
 
         :param piece: initial piece-information
         :param in_pos0: True if atomic in pos0; False otherwise (pos1)
         :param positive_dir: True if moving in positive direction; False else
-        :return: None if the move failed; the new coords if succeeded
+        :param max_atomics: stop after this many successful atomics
+        :return: how many atomics succeeded
         """
 
-        if in_pos0:
-            check_string = Mover._atomic_to_check_string(0, positive_dir)
-            piece_new = Piece.from_atomic_pos0(piece, positive_dir)
-        else:
-            check_string = Mover._atomic_to_check_string(1, positive_dir)
-            piece_new = Piece.from_atomic_pos1(piece, positive_dir)
+        pid, rot = piece.pid, piece.config.rot
+        pos0, pos1 = piece.config.pos.tolist()
+        check_mask = Mover._atomic_to_check_mask(1 - in_pos0, positive_dir)
+        delta = 1 if positive_dir else -1
+        bad_placement = self._bad_placement
 
-        if self.bad_boundaries_collision(check_string, piece_new):
-            return None
-        return piece_new
+        n_atomics = 0
+        while n_atomics < max_atomics:
+            if in_pos0:
+                pos0 += delta
+            else:
+                pos1 += delta
+            if bad_placement(check_mask, pid, rot, pos0, pos1):
+                break
+            n_atomics += 1
+        return n_atomics
 
     def attempt_atomic_pos0(self, piece: Piece, positive_dir: bool) -> Optional[Piece]:
         """
-        Razor-thin wrapper to perform atomic-pos0.
+        Perform atomic-pos0:
+        1.  perform the boundary-collision check, on the plain ints
+        2.  build the new piece, only if the check passed
 
         :param piece:
         :param positive_dir:
-        :return:
+        :return: None if the move failed; the new piece if succeeded
         """
 
-        return self._attempt_atomic_pos(piece, True, positive_dir)
+        pos0, pos1 = piece.config.pos.tolist()
+        if positive_dir:
+            check_mask, pos0 = Mover.check_bit_d, pos0 + 1
+        else:
+            check_mask, pos0 = Mover.check_bit_u, pos0 - 1
+
+        if self._bad_placement(check_mask, piece.pid, piece.config.rot, pos0, pos1):
+            return None
+        return Piece.from_atomic_pos0(piece, positive_dir)
 
     def attempt_atomic_pos1(self, piece: Piece, positive_dir: bool) -> Optional[Piece]:
         """
-        Razor-thin wrapper to perform atomic-pos1.
+        Perform atomic-pos1, as attempt_atomic_pos0().
 
         :param piece:
         :param positive_dir:
-        :return:
+        :return: None if the move failed; the new piece if succeeded
         """
 
-        return self._attempt_atomic_pos(piece, False, positive_dir)
+        pos0, pos1 = piece.config.pos.tolist()
+        if positive_dir:
+            check_mask, pos1 = Mover.check_bit_r, pos1 + 1
+        else:
+            check_mask, pos1 = Mover.check_bit_l, pos1 - 1
+
+        if self._bad_placement(check_mask, piece.pid, piece.config.rot, pos0, pos1):
+            return None
+        return Piece.from_atomic_pos1(piece, positive_dir)
 
     def attempt_atomic_rot(self, piece: Piece, positive_dir: bool) -> Optional[Piece]:
         """
@@ -182,16 +232,44 @@ class Mover:
         :return: new piece-info if successful, None otherwise
         """
 
-        check_string = Mover._atomic_to_check_string(2, positive_dir)
+        pid = piece.pid
+        pos0, pos1 = piece.config.pos.tolist()
 
-        piece_new = Piece.from_atomic_rot(piece, positive_dir)
+        state = self._rotate(pid, piece.config.rot, pos0, pos1, positive_dir)
+        if state is None:
+            return None
+        rot, pos0, pos1 = state
+        return Piece.from_init(pid, Config(np.array((pos0, pos1)), rot))
 
-        if self.bad_boundaries_collision(check_string, piece_new):
-            return self._try_srs_shifts(piece_new, positive_dir)
+    def _rotate(
+        self, pid: int, rot: int, pos0: int, pos1: int, positive_dir: bool
+    ) -> Optional[tuple[int, int, int]]:
+        """
+        Perform an atomic-rot, as attempt_atomic_rot(), on the plain ints of a
+        piece.
+
+        :param pid: which piece
+        :param rot: config-rot of the piece
+        :param pos0: config-pos0 of the piece
+        :param pos1: config-pos1 of the piece
+        :param positive_dir: True if in positive dir; False otherwise
+        :return: the new (rot, pos0, pos1) if successful, None otherwise
+        """
+
+        check_mask = Mover._atomic_to_check_mask(2, positive_dir)
+        rot_new = (rot + (1 if positive_dir else -1)) % 4
 
-        return piece_new
+        if not self._bad_placement(check_mask, pid, rot_new, pos0, pos1):
+            return rot_new, pos0, pos1
 
-    def _try_srs_shifts(self, piece: Piece, positive_dir: bool) -> Optional[Piece]:
+        pos = self._try_srs_shifts(pid, rot_new, pos0, pos1, positive_dir)
+        if pos is None:
+            return None
+        return (rot_new,) + pos
+
+    def _try_srs_shifts(
+        self, pid: int, rot: int, pos0: int, pos1: int, positive_dir: bool
+    ) -> Optional[tuple[int, int]]:
         """
         Check every SRS-shift candidate (in order) after initially failed
         atomic-rot; this can be broken down to:
@@ -202,18 +280,23 @@ class Mover:
             piece-info; if none of the candidates are acceptable, return None
             to signal failure
 
-        :param piece: piece AFTER initial atomic-rot
+        NOTE:
+        The candidates are checked on plain ints against the table of
+        placements of the field: the caller makes only the successful one into
+        a piece.
+
+        :param pid: which piece
+        :param rot: config-rot AFTER initial atomic-rot
+        :param pos0: config-pos0 of the piece
+        :param pos1: config-pos1 of the piece
         :param positive_dir: True if in positive dir; False otherwise
-        :return: the new piece if found; None otherwise
+        :return: the new (pos0, pos1) if found; None otherwise
         """
-        pid = piece.pid
-        rot = piece.config.rot
-        srs_shifts = Kick.get_srs_candidates(pid, rot, positive_dir)
 
-        for shift in srs_shifts:
-            piece_new = Piece.from_multi_pos(piece, shift)
-            if not self.bad_boundaries_collision("LRUD", piece_new):
-                return piece_new
+        fits = self._field.fits
+        for shift0, shift1 in _SRS_SHIFTS[pid][rot][positive_dir]:
+            if fits(pid, rot, pos0 + shift0, pos1 + shift1):
+                return pos0 + shift0, pos1 + shift1
 
         return None
 
@@ -233,14 +316,39 @@ class Mover:
         :return:
         """
 
-        if move_type == 0:
-            atomic_mover = self.attempt_atomic_pos0
-        elif move_type == 1:
-            atomic_mover = self.attempt_atomic_pos1
-        else:
-            atomic_mover = self.attempt_atomic_rot
+        if move_type != 0 and move_type != 1:
+            move_type = 2
+        return self._atomic_movers[move_type](piece, pos_dir)
 
-        return atomic_mover(piece, pos_dir)
+    def attempt_all_atomics(self, piece: Piece) -> tuple:
+        """
+        Attempt every atomic from the same piece at once, i.e., answer "which
+        moves are legal from here?" in one call. This is used for bot-plays,
+        which would otherwise go through attempt_atomic() six times.
+
+        NOTE:
+        Every atomic is checked on the plain ints of the piece: a new piece is
+        built only for those that succeed.
+
+        :param piece: current piece-info
+        :return: format: [move_type][pos_dir], each entry as attempt_atomic()
+        would return it, i.e., the new piece-info if successful, None otherwise
+        """
+
+        return (
+            (
+                self.attempt_atomic_pos0(piece, False),
+                self.attempt_atomic_pos0(piece, True),
+            ),
+            (
+                self.attempt_atomic_pos1(piece, False),
+                self.attempt_atomic_pos1(piece, True),
+            ),
+            (
+                self.attempt_atomic_rot(piece, False),
+                self.attempt_atomic_rot(piece, True),
+            ),
+        )
 
     @staticmethod
     def multi_to_dir_delta(delta: int) -> tuple[bool, int]:
@@ -284,21 +392,27 @@ class Mover:
 
         positive_dir, delta = Mover.multi_to_dir_delta(delta)
 
-        if move_type == 0:
-            atomic_mover = self.attempt_atomic_pos0
-        elif move_type == 1:
-            atomic_mover = self.attempt_atomic_pos1
-        else:
-            atomic_mover = self.attempt_atomic_rot
+        if move_type == 0 or move_type == 1:
+            if delta == 0:
+                return piece
+            if self._slide(piece, move_type == 0, positive_dir, delta) < delta:
+                return None
+            signed_delta = delta if positive_dir else -delta
+            if move_type == 0:
+                return Piece.from_multi_pos0(piece, signed_delta)
+            return Piece.from_multi_pos1(piece, signed_delta)
 
+        if delta == 0:
+            return piece
+        pid = piece.pid
+        state = (piece.config.rot,) + tuple(piece.config.pos.tolist())
         for __ in range(delta):
-            result = atomic_mover(piece, positive_dir)
-            if result is None:
+            state = self._rotate(pid, *state, positive_dir)
+            if state is None:
                 return None
-            else:
-                piece = result
 
-        return piece
+        rot, pos0, pos1 = state
+        return Piece.from_init(pid, Config(np.array((pos0, pos1)), rot))
 
     def attempt_maxout(self, move_type: int, piece: Piece, pos_dir: bool) -> Piece:
         """
@@ -321,22 +435,31 @@ class Mover:
         :return:
         """
 
-        if move_type == 0:
-            atomic_mover = self.attempt_atomic_pos0
-        elif move_type == 1:
-            atomic_mover = self.attempt_atomic_pos1
-        else:
-            atomic_mover = self.attempt_atomic_rot
-
-        maxed_out = False
-        while not maxed_out:
-            result = atomic_mover(piece, pos_dir)
-            if result is None:
-                maxed_out = True
+        if move_type == 0 or move_type == 1:
+            pid, rot = piece.pid, piece.config.rot
+            pos0, pos1 = piece.config.pos.tolist()
+            # from a legal state, the hard-drop is found at once on the field
+            if move_type == 0 and pos_dir and self._field.fits(pid, rot, pos0, pos1):
+                n_atomics = self._field.drop_distance(pid, rot, pos0, pos1)
             else:
-                piece = result
+                n_atomics = self._slide(piece, move_type == 0, pos_dir, sys.maxsize)
+            if n_atomics == 0:
+                return piece
+            signed_delta = n_atomics if pos_dir else -n_atomics
+            if move_type == 0:
+                return Piece.from_multi_pos0(piece, signed_delta)
+            return Piece.from_multi_pos1(piece, signed_delta)
+
+        pid = piece.pid
+        state = (piece.config.rot,) + tuple(piece.config.pos.tolist())
+        state_new = self._rotate(pid, *state, pos_dir)
+        if state_new is None:
+            return piece
+        while state_new is not None:
+            state, state_new = state_new, self._rotate(pid, *state_new, pos_dir)
 
-        return piece
+        rot, pos0, pos1 = state
+        return Piece.from_init(pid, Config(np.array((pos0, pos1)), rot))
 
     def attempt_drop(self, piece: Piece) -> Piece:
         """
@@ -381,6 +504,10 @@ class Mover:
         3.  apply user's pos1-input
         4.  check boundaries and collision
 
+        NOTE:
+        The three steps are applied to the plain ints of the piece: only the
+        final piece is built, after passing the checks.
+
         NOTE:
         1.  should be called shortly after init_piece()
         2.  the passed in argument of the init-pos does not necessarily have to
@@ -393,78 +520,59 @@ class Mover:
         :return: result of the move of PRE-phase
         """
 
-        if not delta_rot == 0:
-            piece = Piece.from_multi_rot(piece, delta_rot)
-
-        zero_pos = self.analyzer.get_zero_pos(piece.pid, piece.config.rot)
-        piece = Piece.to_absolute_pos(piece, zero_pos)
-        # print("Piece in ZERO-pos:", piece)
-
-        if not delta_pos1 == 0:
-            piece = Piece.from_multi_pos1(piece, delta_pos1)
+        pid = piece.pid
+        rot = (piece.config.rot + delta_rot) % 4
+        pos0, pos1 = self._analyzer.get_zero_pos(pid, rot).tolist()
+        pos1 += delta_pos1
 
-        if self.bad_boundaries_collision("LR", piece):
+        check_mask = Mover.check_bit_l | Mover.check_bit_r
+        if self._bad_placement(check_mask, pid, rot, pos0, pos1):
             return None
-        return piece
+        return Piece.from_init(pid, Config(np.array((pos0, pos1)), rot))
 
-    def _bad_boundary(self, piece: Piece, is_pos0: bool, pos_dir: bool) -> bool:
+    def bad_boundaries_collision(self, check_mask: int, piece: Piece):
         """
-        Check if one boundary has been exceeded.
+        Perform the standard check:
+        1.  Boundaries check
+        2.  collision check
 
+        :param check_mask: OR of any of the check-bits, see
+        check_string_to_mask() to convert from a check-string
         :param piece:
-        :param is_pos0:
-        :param pos_dir:
-        :return: True if exceeded this boundary, False otherwise
+        :return:
         """
 
-        relevant_pos_idx = 0 if is_pos0 else 1
-        relevant_pos = piece.config.pos[relevant_pos_idx]
-
-        limit = self.analyzer.get_valid_range(
-            piece.pid, piece.config.rot, is_pos0, pos_dir
-        )
-        # print("boundary check: {0} VS {1}".format(relevant_pos, limit))
+        pos0, pos1 = piece.config.pos.tolist()
+        return self._bad_placement(check_mask, piece.pid, piece.config.rot, pos0, pos1)
 
-        if pos_dir:
-            exceeded_boundary = relevant_pos > limit
-        else:
-            exceeded_boundary = relevant_pos < limit
-        return exceeded_boundary
-
-    def _bad_boundaries(self, piece: Piece, check_str: str) -> bool:
+    def _bad_placement(
+        self, check_mask: int, pid: int, rot: int, pos0: int, pos1: int
+    ) -> bool:
         """
-        Check if multiple boundaries have been exceeded.
+        Perform the standard check, as bad_boundaries_collision(), on the
+        plain ints of a piece: no piece needs to be built beforehand.
 
-        :param piece:
-        :param check_str: any subset of "DURL"
-        :return:
+        :param check_mask: OR of any of the check-bits
+        :param pid: which piece
+        :param rot: config-rot of the piece
+        :param pos0: config-pos0 of the piece
+        :param pos1: config-pos1 of the piece
+        :return: True if failed checks; False otherwise
         """
 
-        for curr_check_str in check_str:
-            # print("checking boundary {0}".format(curr_check_str))
-            in_pos0, in_pos_dir = Mover.check_string_to_check_tuple[curr_check_str]
-            exceeded_curr = self._bad_boundary(piece, in_pos0, in_pos_dir)
-            if exceeded_curr:
-                print("Failed at {0}".format(curr_check_str))
+        # within all boundaries iff in the table of placements: the boundaries
+        # need (and get) a closer look only otherwise
+        mask = self._field.placement_mask(pid, rot, pos0, pos1)
+        if mask is None:
+            if self._bad_boundaries[pid][rot](check_mask, pos0, pos1):
                 return True
+            collided = self._field.has_collision_piece(pid, rot, pos0, pos1)
+        else:
+            collided = bool(self._field.board & mask)
 
-        return False
-
-    def bad_boundaries_collision(self, check_str: str, piece: Piece):
-        """
-        Perform the standard check:
-        1.  Boundaries check
-        2.  collision check
-
-        :param check_str:
-        :param piece:
-        :return:
-        """
-
-        if self._bad_boundaries(piece, check_str):
-            return True
-        if self.field.has_collision(piece.coord):
-            print("Failed collision")
+        if collided:
+            if __debug__ and _log.isEnabledFor(logging.DEBUG):
+                _log.debug("Failed collision")
             return True
 
         return False
@@ -486,7 +594,8 @@ class BoundaryAnalyzer:
             ((+0, +18), (-1, +7)),
             ((+0, +18), (-1, +7)),
             ((+0, +18), (-1, +7)),
-        )
+        ),
+        dtype=np.int8,
     )
 
     _std_valid_range_i = np.array(
@@ -495,7 +604,8 @@ class BoundaryAnalyzer:
             ((+0, +16), (-1, +8)),
             ((-2, +17), (+0, +6)),
             ((+0, +16), (-2, +7)),
-        )
+        ),
+        dtype=np.int8,
     )
 
     _std_valid_range_szljt = np.array(
@@ -504,9 +614,15 @@ class BoundaryAnalyzer:
             ((+0, +17), (+0, +8)),
             ((-1, +17), (+0, +7)),
             ((+0, +17), (-1, +7)),
-        )
+        ),
+        dtype=np.int8,
     )
 
+    # shared by every analyzer of a standard field
+    _std_valid_range_o.flags.writeable = False
+    _std_valid_range_i.flags.writeable = False
+    _std_valid_range_szljt.flags.writeable = False
+
     def __init__(self, size: tuple[int, int]):
         self._size0, self._size1 = size
 
@@ -521,6 +637,23 @@ class BoundaryAnalyzer:
                 RelCoord.rel_range_szljt
             )
 
+        # all the above, indexed directly by pid:
+        # (pid, rot, pos0-or-pos1, min-or-max)
+        self._limits = np.stack(
+            (self._valid_range_o, self._valid_range_i) + (self._valid_range_szljt,) * 5
+        )
+        # the same, as (nested) python ints: no boxing of np-scalars on access
+        self._limits_list = self._limits.tolist()
+        # the zero-pos of every (pid, rot), see get_zero_pos()
+        self._zero_pos = self._limits[:, :, :, 0].astype(int)
+        self._zero_pos.flags.writeable = False
+
+        # format: [pid][rot]
+        self._boundary_checkers = tuple(
+            tuple(self.make_boundary_checker(pid, rot) for rot in range(4))
+            for pid in range(7)
+        )
+
     @property
     def size0(self):
         return self._size0
@@ -529,6 +662,10 @@ class BoundaryAnalyzer:
     def size1(self):
         return self._size1
 
+    @property
+    def boundary_checkers(self):
+        return self._boundary_checkers
+
     @property
     def valid_range_o(self):
         return self._valid_range_o
@@ -550,7 +687,11 @@ class BoundaryAnalyzer:
         """
 
         limits = np.array(((0, self.size0), (0, self.size1)))
-        return limits - rel_range
+        valid_range = limits - rel_range
+        if np.abs(valid_range).max() <= np.iinfo(np.int8).max:
+            valid_range = valid_range.astype(np.int8)
+        valid_range.flags.writeable = False
+        return valid_range
 
     def get_zero_pos(self, pid: int, rot: int) -> np.ndarray:
         """
@@ -583,19 +724,75 @@ class BoundaryAnalyzer:
         a piece to its (additive) 0-position, such that subsequent shift inputs
         (in pos) equates to the final, absolute state (in pos).
 
+        NOTE:
+        The zero-pos is a (read-only) view into the pre-computed table of all
+        zero-pos: copy it before modifying.
+
         :param pid:
         :param rot:
         :return:
         """
 
-        if pid == 0:
-            valid_range_all = self.valid_range_o[rot]
-        elif pid == 1:
-            valid_range_all = self.valid_range_i[rot]
-        else:
-            valid_range_all = self.valid_range_szljt[rot]
+        return self._zero_pos[pid, rot]
 
-        return np.array((valid_range_all[0][0], valid_range_all[1][0]))
+    def get_valid_ranges(
+        self, pid: int, rot: int
+    ) -> tuple[tuple[int, int], tuple[int, int]]:
+        """
+        Get the valid ranges of a piece in both pos0 and pos1 at once, for
+        checking multiple boundaries of the same piece.
+
+        :param pid:
+        :param rot:
+        :return: ((min-pos0, max-pos0), (min-pos1, max-pos1))
+        """
+
+        return self._limits_list[pid][rot]
+
+    def make_boundary_checker(
+        self, pid: int, rot: int
+    ) -> Callable[[int, int, int], bool]:
+        """
+        Make the check of multiple boundaries for a piece of one pid in one
+        rot: the limits of this piece are baked into the returned closure,
+        which is called as:
+            checker(check_mask, pos0, pos1)
+        and returns True if any boundary of the check-mask has been exceeded,
+        False otherwise.
+
+        NOTE:
+        The four checks are unrolled, in the order of "LRUD"; each one is
+        skipped unless its check-bit is set.
+
+        :param pid:
+        :param rot:
+        :return:
+        """
+
+        (min0, max0), (min1, max1) = self.get_valid_ranges(pid, rot)
+        bit_l, bit_r = Mover.check_bit_l, Mover.check_bit_r
+        bit_u, bit_d = Mover.check_bit_u, Mover.check_bit_d
+
+        def checker(check_mask: int, pos0: int, pos1: int) -> bool:
+            if check_mask & bit_l and pos1 < min1:
+                if __debug__ and _log.isEnabledFor(logging.DEBUG):
+                    _log.debug("Failed at L")
+                return True
+            if check_mask & bit_r and pos1 > max1:
+                if __debug__ and _log.isEnabledFor(logging.DEBUG):
+                    _log.debug("Failed at R")
+                return True
+            if check_mask & bit_u and pos0 < min0:
+                if __debug__ and _log.isEnabledFor(logging.DEBUG):
+                    _log.debug("Failed at U")
+                return True
+            if check_mask & bit_d and pos0 > max0:
+                if __debug__ and _log.isEnabledFor(logging.DEBUG):
+                    _log.debug("Failed at D")
+                return True
+            return False
+
+        return checker
 
     def get_valid_range(self, pid: int, rot: int, is_pos0: bool, pos_dir: bool):
         """
@@ -615,17 +812,7 @@ class BoundaryAnalyzer:
         :return:
         """
 
-        if pid == 0:
-            valid_range_all = self.valid_range_o[rot]
-        elif pid == 1:
-            valid_range_all = self.valid_range_i[rot]
-        else:
-            valid_range_all = self.valid_range_szljt[rot]
-
-        idx_pos = 0 if is_pos0 else 1
-        idx_dir = 1 if pos_dir else 0
-
-        return valid_range_all[idx_pos][idx_dir]
+        return self._limits_list[pid][rot][not is_pos0][pos_dir]
 
 
 def analyzer_boundary_test():
@@ -719,44 +906,21 @@ def boundary_test():
     # Right, within boundary
     piece = Piece.to_absolute_pos(piece, np.array((0, 6)))
     print(piece)
-    print(m.bad_boundaries_collision("DURL", piece))
+    print(m.bad_boundaries_collision(Mover.check_bits_all, piece))
     # Right, OUTSIDE boundary
     piece = Piece.to_absolute_pos(piece, np.array((0, 7)))
     print(piece)
-    print(m.bad_boundaries_collision("DURL", piece))
+    print(m.bad_boundaries_collision(Mover.check_bits_all, piece))
 
     # LEFT, within boundary
     piece = Piece.to_absolute_pos(piece, np.array((5, 0)))
     print(piece)
-    print(m.bad_boundaries_collision("DURL", piece))
+    print(m.bad_boundaries_collision(Mover.check_bits_all, piece))
 
     # LEFT, OUTSIDE
     piece = Piece.to_absolute_pos(piece, np.array((5, -1)))
     print(piece)
-    print(m.bad_boundaries_collision("DURL", piece))
-
-    # NOTE:
-    # the following code demonstrates direct usage of boundary-checks, avoid if
-    # possible as the boundary-collision check short-circuits with the
-    # boundary-checks performed first anyway
-    #
-    # # Up, within boundary
-    # Piece.to_absolute_pos(piece, np.array((-1, 0)))
-    # print(piece)
-    # print(m._bad_boundary(piece, True, False))
-    # # Up, OUTSIDE boundary
-    # piece = Piece.to_absolute_pos(piece, np.array((-2, 0)))
-    # print(piece)
-    # print(m._bad_boundary(piece, True, False))
-    #
-    # # Down, within boundary
-    # piece = Piece.to_absolute_pos(piece, np.array((18, 0)))
-    # print(piece)
-    # print(m._bad_boundary(piece, True, True))
-    # # Up, OUTSIDE boundary
-    # piece = Piece.to_absolute_pos(piece, np.array((19, 0)))
-    # print(piece)
-    # print(m._bad_boundary(piece, True, True))
+    print(m.bad_boundaries_collision(Mover.check_bits_all, piece))
 
 
 def atomic_test():
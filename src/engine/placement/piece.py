@@ -174,6 +174,15 @@ class Config:
 
         self.pos, self.rot = Config.unpack(config_new)
 
+    def copy(self) -> "Config":
+        """
+        Make an independent copy of this config.
+
+        :return:
+        """
+
+        return Config(self.pos, self.rot)
+
     @classmethod
     def new_from_pos0(cls, pos0: int):
         return cls(np.array([pos0, 0]), 0)
@@ -218,6 +227,8 @@ class Piece:
     The coord is fetched from CoordFactory with:
     1.  the pid
     2.  the config.
+    on first access only: a piece that is merely checked (see Mover) and then
+    thrown away never builds its coord.
 
     """
 
@@ -236,7 +247,10 @@ class Piece:
 
         self._pid = pid
         self._config = config
+        # if not given, computed on first access, see coord
         self._coord = coord
+        # computed on first access, see vertical_range
+        self._vertical_range = None
 
     def __str__(self):
         """
@@ -258,6 +272,8 @@ class Piece:
     @pid.setter
     def pid(self, value: int):
         self._pid = value
+        self._coord = None
+        self._vertical_range = None
 
     @property
     def config(self):
@@ -266,15 +282,35 @@ class Piece:
     @config.setter
     def config(self, value: Config):
         self._config.assign(value)
+        self._coord = None
+        self._vertical_range = None
 
     @property
     def coord(self):
+        if self._coord is None and self._pid is not None:
+            self._coord = CoordFactory.get_coord(self._pid, self._config)
         return self._coord
 
     @coord.setter
     def coord(self, value: np.ndarray):
         self._coord = value
 
+    @property
+    def vertical_range(self) -> np.ndarray:
+        """
+        The vertical range of the piece, as (upper_row, lower_row + 1), i.e.,
+        the rows to target for the line-clear after freezing this piece.
+
+        NOTE:
+        Calculated only once (on first access) for each piece.
+
+        :return:
+        """
+
+        if self._vertical_range is None:
+            self._vertical_range = CoordFactory.get_range(self.pid, self.config, True)
+        return self._vertical_range
+
     @classmethod
     def from_init(cls, pid: int, config: Config) -> "Piece":
         """
@@ -289,16 +325,15 @@ class Piece:
         :return:
         """
 
-        coord = CoordFactory.get_coord(pid, config)
-        return cls(pid, config, coord)
+        return cls(pid, config)
 
     @classmethod
     def from_atomic_pos0(cls, piece: "Piece", positive_dir: bool) -> "Piece":
         """
         Construct the new piece-info after an atomic-pos0.
         NOTE:
-        The new coordinates are easily found by just shifting the existing
-        coordinates.
+        The new coordinates are left to be calculated on first access (see
+        coord).
 
         :param piece: current piece-info
         :param positive_dir:
@@ -307,18 +342,15 @@ class Piece:
 
         config_new = piece.config.new_from_atomic_pos0(positive_dir)
 
-        delta = 1 if positive_dir else -1
-        coord_new = piece.coord + np.array([delta, 0])
-
-        return cls(piece.pid, config_new, coord_new)
+        return cls(piece.pid, config_new)
 
     @classmethod
     def from_atomic_pos1(cls, piece: "Piece", positive_dir: bool) -> "Piece":
         """
         Construct the new piece-info after an atomic-pos1.
         NOTE:
-        The new coordinates are easily found by just shifting the existing
-        coordinates.
+        The new coordinates are left to be calculated on first access (see
+        coord).
 
         :param piece: current piece-info
         :param positive_dir:
@@ -327,18 +359,15 @@ class Piece:
 
         config_new = piece.config.new_from_atomic_pos1(positive_dir)
 
-        delta = 1 if positive_dir else -1
-        coord_new = piece.coord + np.array([0, delta])
-
-        return cls(piece.pid, config_new, coord_new)
+        return cls(piece.pid, config_new)
 
     @classmethod
     def from_atomic_rot(cls, piece: "Piece", positive_dir: bool) -> "Piece":
         """
         Construct the new piece-info after an atomic-rot.
         NOTE:
-        Since the rotation is modified, must fetch the new coordinates
-        from CoordsFactory.
+        Since the rotation is modified, the new coordinates are fetched from
+        CoordsFactory, on first access (see coord).
 
         :param piece: current piece-info
         :param positive_dir:
@@ -346,9 +375,8 @@ class Piece:
         """
 
         config_new = piece.config.new_from_atomic_rot(positive_dir)
-        coord_new = CoordFactory.get_coord(piece.pid, config_new)
 
-        return cls(piece.pid, config_new, coord_new)
+        return cls(piece.pid, config_new)
 
     @classmethod
     def from_multi_pos0(cls, piece: "Piece", delta: int) -> "Piece":
@@ -364,9 +392,8 @@ class Piece:
         """
 
         config_new = piece.config.new_from_multi_pos0(delta)
-        coord_new = piece.coord + np.array([delta, 0])
 
-        return cls(piece.pid, config_new, coord_new)
+        return cls(piece.pid, config_new)
 
     @classmethod
     def from_multi_pos1(cls, piece: "Piece", delta: int) -> "Piece":
@@ -378,16 +405,14 @@ class Piece:
         :return:
         """
         config_new = piece.config.new_from_multi_pos1(delta)
-        coord_new = piece.coord + np.array([0, delta])
 
-        return cls(piece.pid, config_new, coord_new)
+        return cls(piece.pid, config_new)
 
     @classmethod
     def from_multi_rot(cls, piece: "Piece", delta: int) -> "Piece":
         config_new = piece.config.new_from_multi_rot(delta)
-        coord_new = CoordFactory.get_coord(piece.pid, config_new)
 
-        return cls(piece.pid, config_new, coord_new)
+        return cls(piece.pid, config_new)
 
     @classmethod
     def from_multi_pos(cls, piece: "Piece", delta: np.ndarray):
@@ -400,9 +425,8 @@ class Piece:
         """
 
         config_new = piece.config.new_from_multi_pos(delta)
-        coord_new = piece.coord + delta
 
-        return cls(piece.pid, config_new, coord_new)
+        return cls(piece.pid, config_new)
 
     @classmethod
     def from_multi_pos1_rot(
@@ -420,9 +444,8 @@ class Piece:
         """
 
         config_new = piece.config.new_from_multi_pos1_rot(delta_pos1, delta_rot)
-        coord_new = CoordFactory.get_coord(piece.pid, config_new)
 
-        return cls(piece.pid, config_new, coord_new)
+        return cls(piece.pid, config_new)
 
     @classmethod
     def from_multi(cls, piece: "Piece", delta: Config) -> "Piece":
@@ -435,9 +458,8 @@ class Piece:
         """
 
         config_new = piece.config.new_from_multi(delta)
-        coord_new = CoordFactory.get_coord(piece.pid, config_new)
 
-        return cls(piece.pid, config_new, coord_new)
+        return cls(piece.pid, config_new)
 
     @classmethod
     def to_absolute(cls, piece: "Piece", target: Config) -> "Piece":
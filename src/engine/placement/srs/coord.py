@@ -99,7 +99,8 @@ class RelCoord:
                 ((+1, +0), (+1, +1), (+2, +1), (+1, +2)),
                 ((+0, +1), (+1, +1), (+2, +1), (+1, +2)),
             ),
-        )
+        ),
+        dtype=np.int8,
     )
 
     rel_range_o = np.array(
@@ -109,7 +110,8 @@ class RelCoord:
             ((+0, +2), (+1, +3)),
             ((+0, +2), (+1, +3)),
             ((+0, +2), (+1, +3)),
-        )
+        ),
+        dtype=np.int8,
     )
 
     rel_range_i = np.array(
@@ -118,7 +120,8 @@ class RelCoord:
             ((+0, +4), (+1, +2)),
             ((+2, +3), (+0, +4)),
             ((+0, +4), (+2, +3)),
-        )
+        ),
+        dtype=np.int8,
     )
 
     rel_range_szljt = np.array(
@@ -127,9 +130,22 @@ class RelCoord:
             ((+0, +3), (+0, +2)),
             ((+1, +3), (+0, +3)),
             ((+0, +3), (+1, +3)),
-        )
+        ),
+        dtype=np.int8,
     )
 
+    # all the above, indexed directly by pid: (pid, rot, pos0-or-pos1, low-high)
+    _rel_ranges = np.stack(
+        (rel_range_o, rel_range_i) + (rel_range_szljt,) * 5,
+    )
+
+    # shared by every piece: never to be modified
+    _rel_coords.flags.writeable = False
+    rel_range_o.flags.writeable = False
+    rel_range_i.flags.writeable = False
+    rel_range_szljt.flags.writeable = False
+    _rel_ranges.flags.writeable = False
+
     @staticmethod
     def get_rel_coord(pid: int, rot: int) -> np.ndarray:
         """
@@ -162,15 +178,7 @@ class RelCoord:
         :return:
         """
 
-        if pid == 0:
-            rel_range_all = RelCoord.rel_range_o
-        elif pid == 1:
-            rel_range_all = RelCoord.rel_range_i
-        else:
-            rel_range_all = RelCoord.rel_range_szljt
-
-        idx = 0 if is_pos0 else 1
-        return rel_range_all[rot][idx]
+        return RelCoord._rel_ranges[pid, rot, 0 if is_pos0 else 1]
 
 
 def range_test():
@@ -17,8 +17,12 @@
 #
 
 
+import logging
+
 import numpy as np
 
+_log = logging.getLogger(__name__)
+
 
 class Kick:
     """
@@ -84,6 +88,27 @@ class Kick:
         )
     )
 
+    @staticmethod
+    def _make_srs_table() -> tuple:
+        """
+        Lay out the candidates of every piece once, such that fetching the
+        candidates of one configuration is merely a (read-only) view:
+            srs_table[pid][2 * rot + (1 - positive_dir)]
+
+        NOTE:
+        The single candidate of the o-piece is repeated for every index.
+
+        :return: one contiguous int8-array of shape (8, n_candidates, 2) per pid
+        """
+
+        srs_o = np.broadcast_to(Kick.srs_o[0], (8,) + Kick.srs_o[0].shape)
+        table = []
+        for srs in (srs_o, Kick.srs_i) + (Kick.srs_szljt,) * 5:
+            srs = np.ascontiguousarray(srs, dtype=np.int8)
+            srs.flags.writeable = False
+            table.append(srs)
+        return tuple(table)
+
     @staticmethod
     def get_srs_candidates(pid: int, rot: int, positive_dir=True) -> np.array:
         """
@@ -98,24 +123,23 @@ class Kick:
         :return: potential shifts-of-center to try ending the rotation at
         """
 
-        print(
-            "SRS-triggered.\npid: {0}; rot: {1}, dir: {2}".format(
-                pid, rot, positive_dir
+        idx = 2 * rot + (1 - positive_dir)
+        srs_shifts_candidates = Kick.srs_table[pid][idx]
+
+        if __debug__ and _log.isEnabledFor(logging.DEBUG):
+            _log.debug(
+                "SRS-triggered. pid: %s; rot: %s, dir: %s; index: %s; candidates: %s",
+                pid,
+                rot,
+                positive_dir,
+                idx,
+                srs_shifts_candidates.tolist(),
             )
-        )
-        if pid == 0:
-            srs_shifts_candidates = Kick.srs_i
-        else:
-            idx = 2 * rot + (1 - positive_dir)
-            if pid == 1:
-                srs_shifts_candidates = Kick.srs_i[idx]
-            else:
-                srs_shifts_candidates = Kick.srs_szljt[idx]
-            print("Accessing SRS index: {0}".format(idx))
-
-        print("SRS candidates are:{0}".format(srs_shifts_candidates))
         return srs_shifts_candidates
 
 
+Kick.srs_table = Kick._make_srs_table()
+
+
 if __name__ == "__main__":
     pass
@@ -0,0 +1,104 @@
+# The Tetris-Implementation of the Shetris-Project, written from scratch.
+#
+# Copyright (C) 2022 Shengdi 'shc' Chen (me@shengdichen.xyz)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import unittest
+
+import numpy as np
+
+from src.engine.generator import _baggen_pure, baggen
+
+
+class TestPureGenerators(unittest.TestCase):
+    """
+    The pure-python generators must hand out the same pids as the NumPy ones.
+
+    """
+
+    bags = (np.arange(7), np.array((1, 3, 4, 6)), np.array((5,)))
+
+    def test_sequencer_streams_match(self):
+        for bag in self.bags:
+            gen_np, gen_pure = baggen.Sequencer(bag), _baggen_pure.Sequencer(bag)
+            for __ in range(100):
+                self.assertEqual(gen_pure.get_pid(), gen_np.get_pid())
+            for __ in range(100):
+                pids_np, pids_pure = gen_np.get_pids(3), gen_pure.get_pids(3)
+                self.assertIsInstance(pids_pure, np.ndarray)
+                self.assertEqual(pids_pure.dtype, pids_np.dtype)
+                np.testing.assert_array_equal(pids_pure, pids_np)
+
+    def test_shuffler_streams_hold_every_bag(self):
+        """
+        The two shufflers draw from different random sources: compare them by
+        the bag-property instead, i.e., every bag-size slice of the stream is
+        a permutation of the bag.
+
+        """
+
+        for bag in self.bags:
+            for gen in (baggen.Shuffler(bag), _baggen_pure.Shuffler(bag)):
+                for __ in range(50):
+                    pids = [gen.get_pid() for __ in range(bag.size)]
+                    self.assertEqual(sorted(pids), sorted(bag.tolist()))
+
+
+class TestShuffler(unittest.TestCase):
+    def test_gen_many_holds_every_bag(self):
+        """
+        Every bag-size slice of gen_many() is a permutation of the bag, also
+        after later calls have reused the scratch-buffer.
+
+        """
+
+        bag = np.arange(7)
+        gen = baggen.Shuffler(bag)
+        batches = [gen.gen_many(n_bags) for n_bags in (3, 3, 5, 3, 5)]
+        for pids in batches:
+            for bag_shuffled in pids.reshape(-1, bag.size):
+                np.testing.assert_array_equal(np.sort(bag_shuffled), bag)
+
+    def test_gen_many_returns_new_array(self):
+        gen = baggen.Shuffler(np.arange(7))
+        pids = gen.gen_many(4)
+        pids_before = pids.copy()
+        for __ in range(5):
+            gen.gen_many(4)
+        np.testing.assert_array_equal(pids, pids_before)
+
+
+class TestReservoir(unittest.TestCase):
+    def test_peek_at_most_ready_pids(self):
+        """
+        Reading more pids than are ready returns only the ready ones, in order
+        of popping.
+
+        """
+
+        for reservoir, pids in (
+            (baggen._Reservoir(0), np.array((3, 5))),
+            (_baggen_pure._Reservoir(0), [3, 5]),
+        ):
+            reservoir.refill(pids)
+            items, __ = reservoir.read_pop_check(4)
+            self.assertEqual(list(items), [3, 5])
+            self.assertEqual(list(reservoir.ready()), [5])
+
+
+if __name__ == "__main__":
+    unittest.main()
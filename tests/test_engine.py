@@ -0,0 +1,133 @@
+# The Tetris-Implementation of the Shetris-Project, written from scratch.
+#
+# Copyright (C) 2022 Shengdi 'shc' Chen (me@shengdichen.xyz)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import unittest
+
+import numpy as np
+
+from src.engine.engine import Engine
+from src.engine.placement.piece import Config, Piece
+
+
+class TestLineclear(unittest.TestCase):
+    def test_freeze_clears_full_rows(self):
+        """
+        Freeze five o-pieces side by side on the bottom of the field: the two
+        bottom rows become full and must be cleared by the engine.
+
+        """
+
+        engine = Engine((20, 10))
+        # o-piece in rot 0 has its boxes in cols 1 and 2 of its ref-pos
+        for pos1 in range(-1, 9, 2):
+            engine.piece = Piece.from_init(0, Config(np.array([18, pos1]), 0))
+            engine.exec_freeze()
+
+        self.assertFalse(engine.field.field.any())
+
+    def test_freeze_keeps_rows_above(self):
+        """
+        A box above the cleared rows slides down by the number of rows
+        cleared.
+
+        """
+
+        engine = Engine((20, 10))
+        engine.field.set_many(np.array(((17, 4),)))
+        for pos1 in range(-1, 9, 2):
+            engine.piece = Piece.from_init(0, Config(np.array([18, pos1]), 0))
+            engine.exec_freeze()
+
+        expected = np.zeros((20, 10), dtype=bool)
+        expected[19, 4] = True
+        np.testing.assert_array_equal(engine.field.field, expected)
+
+
+class TestFreeze(unittest.TestCase):
+    def test_overlapping_piece_is_written(self):
+        """
+        A piece that overlaps the field is still written, and the line-clear
+        still runs: fill the bottom row except col 5, then freeze an o-piece
+        over cols 4 and 5 of the bottom two rows.
+
+        """
+
+        engine = Engine((20, 10))
+        engine.field.set_many(np.array([(19, col) for col in range(10) if col != 5]))
+        engine.piece = Piece.from_init(0, Config(np.array([18, 3]), 0))
+        engine.exec_freeze()
+
+        expected = np.zeros((20, 10), dtype=bool)
+        expected[19, 4:6] = True
+        np.testing.assert_array_equal(engine.field.field, expected)
+
+
+class TestInitPiece(unittest.TestCase):
+    def test_spawn_config_is_not_shared(self):
+        """
+        Modifying the config of a spawned piece in place leaves the config of
+        every later spawn untouched.
+
+        """
+
+        engine = Engine((20, 10))
+        engine.init_piece()
+        engine.piece.config = Config(np.array([7, 3]), 2)
+
+        for other in (engine, Engine((20, 10))):
+            other.init_piece()
+            self.assertEqual(other.piece.config.pos.tolist(), [-4, 0])
+            self.assertEqual(other.piece.config.rot, 0)
+
+
+class TestClone(unittest.TestCase):
+    def test_fork_is_independent(self):
+        """
+        Playing on a fork leaves the field, the piece and the upcoming pids of
+        the original game untouched.
+
+        """
+
+        engine = Engine((20, 10))
+        engine.init_piece()
+        field_before = engine.field.field
+        config_before = engine.piece.config.pos.tolist(), engine.piece.config.rot
+        reference = engine.clone()
+
+        fork = engine.clone()
+        fork.piece.config = Config(np.array([5, 5]), 1)
+        fork.exec_freeze()
+        for __ in range(10):
+            fork.init_piece()
+
+        np.testing.assert_array_equal(engine.field.field, field_before)
+        self.assertEqual(
+            (engine.piece.config.pos.tolist(), engine.piece.config.rot),
+            config_before,
+        )
+
+        # the original sees the same pids as a fork that has not played
+        for __ in range(10):
+            engine.init_piece()
+            reference.init_piece()
+            self.assertEqual(engine.pid, reference.pid)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# The Tetris-Implementation of the Shetris-Project, written from scratch.
+#
+# Copyright (C) 2022 Shengdi 'shc' Chen (me@shengdichen.xyz)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+
+
+import unittest
+
+import numpy as np
+
+from src.engine.placement.field import Field
+from src.engine.placement.mover import Mover
+from src.engine.placement.piece import Config, Piece
+
+
+def _make_mover() -> Mover:
+    return Mover(Field(np.zeros((20, 10), dtype=int)))
+
+
+def _state(piece: Piece) -> tuple:
+    return piece.pid, piece.config.rot, tuple(piece.config.pos.tolist())
+
+
+class TestAttemptPre(unittest.TestCase):
+    def test_delta_rot_wraps_around(self):
+        """
+        Any delta_rot is taken modulo 4, as a rotation by 4 is no rotation.
+
+        """
+
+        mover = _make_mover()
+        for pid in range(7):
+            piece = Piece.from_init(pid, Config(np.array([-4, 0]), 0))
+            for delta_rot in range(-9, 10):
+                expected = mover.attempt_pre(piece, delta_rot % 4, 3)
+                result = mover.attempt_pre(piece, delta_rot, 3)
+                self.assertEqual(_state(result), _state(expected))
+
+
+class TestAttemptAtomic(unittest.TestCase):
+    def test_other_move_types_rotate(self):
+        """
+        Any move_type other than 0 (pos0) and 1 (pos1) is a rot.
+
+        """
+
+        mover = _make_mover()
+        piece = Piece.from_init(4, Config(np.array([5, 4]), 0))
+        for pos_dir in (False, True):
+            expected = mover.attempt_atomic_rot(piece, pos_dir)
+            for move_type in (-5, -4, -3, -2, -1, 2, 3, 7):
+                result = mover.attempt_atomic(move_type, piece, pos_dir)
+                self.assertEqual(_state(result), _state(expected))
+
+    def test_check_mask_of_other_atomic_types(self):
+        for atomic_type in (-5, -4, -3, -2, -1, 2, 3, 7):
+            for positive_dir in (False, True):
+                self.assertEqual(
+                    Mover._atomic_to_check_mask(atomic_type, positive_dir),
+                    Mover.check_bits_all,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()